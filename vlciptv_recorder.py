@@ -6,7 +6,9 @@
 # and a Series Info pane that shows all tasks belonging to the same series.
 
 import os, re, sys, io, json, gzip, time, threading, subprocess, urllib.request, datetime as dt
-import shutil, zipfile, tempfile
+import codecs, shutil, zipfile, tempfile, pickle, hashlib, functools, heapq, queue
+from array import array
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import xml.etree.ElementTree as ET
@@ -14,12 +16,45 @@ from difflib import get_close_matches
 from csv import reader as csv_reader
 from io import StringIO
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+try:
+    from Levenshtein import ratio as lev_ratio
+except ImportError:
+    lev_ratio = None
+
 APP_TITLE = "VLCIPTV Recorder"
 
 # Correctly define the configuration file location in a user-writable folder
 CONFIG_DIR = os.path.join(os.environ.get("LOCALAPPDATA", os.getcwd()), "VLCIPTVRecorder")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "vlciptv_recorder_config.json")
 
+# EPG cache: raw feed + parsed (chmap, progs), revalidated with ETag/Last-Modified
+EPG_CACHE_RAW  = os.path.join(CONFIG_DIR, "epg_cache.bin")
+EPG_CACHE_PKL  = os.path.join(CONFIG_DIR, "epg_cache.pkl")
+EPG_CACHE_META = os.path.join(CONFIG_DIR, "epg_meta.json")
+EPG_CACHE_VERSION = 3  # bump when the parsed programme dict layout changes
+
 DEFAULTS = {
     "m3u_url": "",
     "epg_url": "",
@@ -36,6 +71,9 @@ DEFAULTS = {
 
 UA = "VLC/3.0.20"
 
+# Playlists above this size are parsed straight from bytes (parse_m3u_bytes) to cap peak memory
+M3U_BYTES_PARSE_MIN = 32 * 1024 * 1024
+
 QUALITY_OPTS = {
     "High":   {"mode": "copy"},  # stream copy
     "Medium": {"mode": "trans", "v_bitrate": "4500k", "a_bitrate": "128k"},
@@ -61,12 +99,38 @@ SUBTXT   = "#93a4bd"
 LOG_BG   = "#0b1220"
 LOG_TXT  = "#d1d5db"
 
+# ---------- precompiled patterns (hot paths: playlist/EPG parse) ----------
+_RE_TVGID     = re.compile(r'tvg-id="([^"]+)"')
+_RE_GROUP     = re.compile(r'group-title="([^"]+)"')
+_RE_XMLTS     = re.compile(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})([+\-]\d{4}|Z)?")
+_RE_DUR_HMS   = re.compile(r"\d+:\d{2}:\d{2}")
+_RE_DUR_UNITS = re.compile(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?")
+_RE_CHARSET   = re.compile(r"charset=([\w\-]+)")
+_RE_WORD      = re.compile(r"\w+")
+
+# ---------- precompiled patterns (UI: preview / scheduling) ----------
+_RE_SAFE_FN   = re.compile(r"[^A-Za-z0-9._-]+")
+_RE_DOTS_MP4  = re.compile(r"\.+(?=\.mp4$)", re.I)
+_RE_CLOCK     = re.compile(r"(\d{1,2}):(\d{2})(?:\s*(am|pm))?")
+_RE_HHMM      = re.compile(r"(\d{2}):(\d{2})")
+_RE_NONALNUM  = re.compile(r"[^a-z0-9]+")
+_RE_TASK_SAFE = re.compile(r"[^A-Za-z0-9_-]+")
+_RE_SUGGEST   = re.compile(r"^>>\s+(.+)$")
+
 # ------------------- config helpers -------------------
+def json_dumps(obj):
+    if orjson is not None: return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def json_loads(data):
+    if orjson is not None: return orjson.loads(data)
+    return json.loads(data)
+
 def load_cfg():
     try:
         if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                d = json.load(f)
+            with open(CONFIG_FILE, "rb") as f:
+                d = json_loads(f.read())
             for k,v in DEFAULTS.items(): d.setdefault(k, v)
             return d
     except Exception:
@@ -76,94 +140,309 @@ def load_cfg():
 def save_cfg(cfg):
     try:
         ensure_dir(CONFIG_DIR)
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
+        with open(CONFIG_FILE, "wb") as f:
+            f.write(json_dumps(cfg))
     except Exception:
         pass
 
 def ensure_dir(p): os.makedirs(p, exist_ok=True)
 
 # ------------------- net helpers -------------------
-def fetch_bytes(url, timeout=60):
-    req = urllib.request.Request(url, headers={"User-Agent": UA})
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        return r.read()
-
-def fetch_text(url, timeout=60, fallback="utf-8"):
-    req = urllib.request.Request(url, headers={"User-Agent": UA})
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        ct = r.headers.get("Content-Type","")
-        enc = fallback
-        m = re.search(r"charset=([\w\-]+)", ct)
-        if m: enc = m.group(1)
-        data = r.read()
+def _make_http_session():
+    # Shared keep-alive session so repeat M3U/EPG fetches reuse the TCP+TLS connection.
+    if requests is None: return None
+    s = requests.Session()
+    s.headers["User-Agent"] = UA
+    adapter = HTTPAdapter(pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.3))
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+_HTTP = _make_http_session()
+
+def fetch_bytes(url, timeout=60, fallback="utf-8"):
+    """Returns (body, encoding): the Content-Type charset if it names a known codec, else fallback."""
+    if _HTTP is not None:
+        with _HTTP.get(url, timeout=timeout, stream=True) as r:
+            r.raise_for_status()
+            ct, data = r.headers.get("Content-Type",""), r.content
+    else:
+        req = urllib.request.Request(url, headers={"User-Agent": UA})
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            ct, data = r.headers.get("Content-Type",""), r.read()
+    enc = fallback
+    m = _RE_CHARSET.search(ct)
+    if m:
+        try: enc = codecs.lookup(m.group(1)).name
+        except LookupError: pass
+    return data, enc
+
+def fetch_conditional(url, etag="", last_modified="", timeout=60):
+    """Conditional GET. Returns (status, headers, body); body is b"" on 304 Not Modified."""
+    hdrs = {}
+    if etag: hdrs["If-None-Match"] = etag
+    if last_modified: hdrs["If-Modified-Since"] = last_modified
+    if _HTTP is not None:
+        with _HTTP.get(url, timeout=timeout, headers=hdrs, stream=True) as r:
+            if r.status_code == 304: return 304, r.headers, b""
+            r.raise_for_status()
+            return r.status_code, r.headers, r.content
+    req = urllib.request.Request(url, headers={"User-Agent": UA, **hdrs})
     try:
-        return data.decode(enc, errors="replace")
-    except Exception:
-        return data.decode(fallback, errors="replace")
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304: return 304, e.headers, b""
+        raise
 
 # ------------------- playlist / epg -------------------
+def m3u_entry(ext, url):
+    name = ext.split(",",1)[-1].strip()
+    tvg = ""
+    grp = ""
+    m = _RE_TVGID.search(ext)
+    if m: tvg = m.group(1)
+    m = _RE_GROUP.search(ext)
+    if m: grp = m.group(1)
+    hay_lc = f"{name} {tvg} {grp} {ext}".lower()
+    return {"name":name, "tvg_id":tvg, "group":grp, "url":url, "ext":ext, "hay_lc":hay_lc,
+            "norm_name":norm_key(name), "norm_tvg":norm_key(tvg)}
+
+def norm_key(s):
+    """Lowercase and drop everything but [a-z0-9]; used to match EPG channel names to playlist entries."""
+    return _RE_NONALNUM.sub("", (s or "").lower())
+
+def build_chan_index(entries):
+    """Two lookups over playlist positions: name token -> [i], and normalised name/tvg-id -> [i]."""
+    tokens, norms = {}, {}
+    for i, e in enumerate(entries):
+        for t in set(_RE_NONALNUM.split(e["name"].lower())):
+            if t: tokens.setdefault(t, []).append(i)
+        for k in {e["norm_name"], e["norm_tvg"]}:
+            if k: norms.setdefault(k, []).append(i)
+    return tokens, norms
+
+def chan_candidates(tokens, norms, ch_lc, ch_norm):
+    """Playlist positions that can score for an EPG channel name: tokenscore matches query
+    tokens as substrings, so each token picks up every indexed name token containing it
+    (like epg_candidates). None when a token is not plain a-z0-9 (it could match across a
+    separator) and the caller must scan all entries."""
+    cand = set(norms.get(ch_norm, ()))
+    for t in ch_lc.split():
+        if _RE_NONALNUM.search(t): return None
+        for w, ids in tokens.items():
+            if t in w: cand.update(ids)
+    return cand
+
 def parse_m3u(txt):
-    lines = [ln.strip() for ln in txt.splitlines()]
+    # Single pass over the lines; no intermediate stripped-line list.
     out = []
     ext = None
-    for ln in lines:
-        if ln.startswith("#EXTINF"): ext = ln
-        elif ln and not ln.startswith("#"):
-            if ext:
-                name = ext.split(",",1)[-1].strip()
-                tvg = ""
-                grp = ""
-                m = re.search(r'tvg-id="([^"]+)"', ext)
-                if m: tvg = m.group(1)
-                m = re.search(r'group-title="([^"]+)"', ext)
-                if m: grp = m.group(1)
-                out.append({"name":name, "tvg_id":tvg, "group":grp, "url":ln, "ext":ext})
-                ext = None
+    for ln in txt.splitlines():
+        ln = ln.strip()
+        if not ln: continue
+        if ln[0] == "#":
+            if ln.startswith("#EXTINF"): ext = ln
+        elif ext:
+            out.append(m3u_entry(ext, ln))
+            ext = None
     return out
 
-def tokenscore(hay, q):
-    hay = hay.lower(); q = q.lower().strip()
+def parse_m3u_bytes(raw, encoding="utf-8"):
+    """parse_m3u for very large playlists: hop between #EXTINF markers with bytes.find and
+    decode only the EXTINF/URL lines we keep, so the whole file never exists as str + lines."""
+    if (b"\n" not in raw and b"\r" in raw) or "#\n".encode(encoding) != b"#\n":
+        return parse_m3u(raw.decode(encoding, "replace"))  # bare-CR line endings / not ASCII-based
+    out = []
+    find = raw.find
+    end = len(raw)
+    pos = find(b"#EXTINF")
+    while pos >= 0:
+        eol = find(b"\n", pos)
+        if eol < 0: break
+        bol = raw.rfind(b"\n", 0, pos) + 1
+        if bol != pos and raw[bol:pos].strip():  # marker isn't at the start of a line
+            pos = find(b"#EXTINF", eol); continue
+        # URL = first following line that is neither blank nor a #directive
+        url = None
+        i = eol + 1
+        while i < end:
+            j = find(b"\n", i)
+            if j < 0: j = end
+            ln = raw[i:j].strip()
+            if ln:
+                if ln[0] != 0x23:  # "#"
+                    url = ln; break
+                if ln.startswith(b"#EXTINF"): break
+            i = j + 1
+        if url is not None:
+            out.append(m3u_entry(raw[pos:eol].strip().decode(encoding, "replace"), url.decode(encoding, "replace")))
+            pos = find(b"#EXTINF", j)
+        else:
+            pos = find(b"#EXTINF", eol)
+    return out
+
+def tokenscore(hay, q, lowered=False):
+    """lowered=True: both hay and q are already lowercased (and q stripped)."""
+    if not lowered:
+        hay = hay.lower(); q = q.lower().strip()
     score = 0
     if q in hay: score += 40
     for t in q.split():
         if t in hay: score += 10
     return score
 
+def score_all(entries, q, key="hay_lc"):
+    """Batch tokenscore over entries whose haystack was lowercased at load time."""
+    q_lc = q.lower().strip()
+    toks = q_lc.split()
+    out = []
+    append = out.append
+    for e in entries:
+        h = e[key]
+        s = 40 if q_lc in h else 0
+        for t in toks:
+            if t in h: s += 10
+        if s: append((s, e))
+    return out
+
+def fastparse_ymd(s):
+    """'YYYY-MM-DD' -> datetime at midnight by slicing; anything else goes through strptime."""
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and (s[:4] + s[5:7] + s[8:]).isdigit():
+        return dt.datetime(int(s[:4]), int(s[5:7]), int(s[8:10]))
+    return dt.datetime.strptime(s, "%Y-%m-%d")
+
+def fastparse_ymdhm(s):
+    """'YYYY-MM-DD HH:MM' -> datetime by slicing; anything else goes through strptime."""
+    if (len(s) == 16 and s[4] == "-" and s[7] == "-" and s[10] == " " and s[13] == ":"
+            and (s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:]).isdigit()):
+        return dt.datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+    return dt.datetime.strptime(s, "%Y-%m-%d %H:%M")
+
 def parse_duration(s):
     s = s.strip().lower()
-    if re.fullmatch(r"\d+:\d{2}:\d{2}", s):
+    if _RE_DUR_HMS.fullmatch(s):
         h,m,sec = map(int, s.split(":")); return h*3600 + m*60 + sec
-    m = re.fullmatch(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?", s)
+    m = _RE_DUR_UNITS.fullmatch(s)
     if m and any(m.groups()):
         h = int(m.group(1) or 0); mi = int(m.group(2) or 0); se = int(m.group(3) or 0)
         return h*3600 + mi*60 + se
     if s.isdigit(): return int(s)*60
     raise ValueError("Use 02:05:00, 125, or 2h5m")
 
-def xmltv_load(epg_url):
-    raw = fetch_bytes(epg_url)
+def epg_cache_meta(epg_url):
+    try:
+        if os.path.exists(EPG_CACHE_RAW):
+            with open(EPG_CACHE_META, "rb") as f:
+                meta = json_loads(f.read())
+            if meta.get("url") == epg_url and meta.get("version") == EPG_CACHE_VERSION:
+                return meta
+    except Exception:
+        pass
+    return {}
+
+def save_epg_cache(meta, raw, parsed):
+    try:
+        ensure_dir(CONFIG_DIR)
+        if raw is not None:
+            with open(EPG_CACHE_RAW, "wb") as f: f.write(raw)
+        with open(EPG_CACHE_PKL, "wb") as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(EPG_CACHE_META, "wb") as f:
+            f.write(json_dumps(meta))
+    except Exception:
+        try: os.remove(EPG_CACHE_META)
+        except Exception: pass
+
+def ids_signature(ids):
+    if not ids: return ""
+    return hashlib.sha1("\n".join(sorted(ids)).encode("utf-8")).hexdigest()
+
+def xmltv_load(epg_url, wanted_ids=None):
+    meta = epg_cache_meta(epg_url)
+    status, headers, raw = fetch_conditional(epg_url, meta.get("etag",""), meta.get("last_modified",""))
+    sig = ids_signature(wanted_ids)
+    if status == 304:
+        if meta.get("wanted") == sig:
+            try:
+                with open(EPG_CACHE_PKL, "rb") as f:
+                    return pickle.load(f)
+            except Exception:
+                pass
+        with open(EPG_CACHE_RAW, "rb") as f:
+            raw = f.read()
+        keep_raw = None
+    else:
+        meta = {"url":epg_url, "version":EPG_CACHE_VERSION, "etag":headers.get("ETag") or "",
+                "last_modified":headers.get("Last-Modified") or "", "size":len(raw)}
+        keep_raw = raw
+    parsed = xmltv_parse(raw, epg_url, wanted_ids)
+    meta["wanted"] = sig
+    save_epg_cache(meta, keep_raw, parsed)
+    return parsed
+
+def xmltv_parse(raw, epg_url, wanted_ids=None):
+    stream = io.BytesIO(raw)
     if epg_url.lower().endswith(".gz") or (len(raw)>2 and raw[:2]==b"\x1f\x8b"):
-        raw = gzip.decompress(raw)
-    root = ET.parse(io.BytesIO(raw)).getroot()
+        if rapidgzip is not None:
+            stream = rapidgzip.RapidgzipFile(stream, parallelization=os.cpu_count() or 1)
+        else:
+            stream = gzip.GzipFile(fileobj=stream)
+    # wanted_ids (M3U tvg-ids) drops channels/programmes the playlist can't record.
     chmap = {}
-    for ch in root.findall("channel"):
-        cid = ch.get("id") or ""
-        names = [dn.text for dn in ch.findall("display-name") if dn.text]
-        chmap[cid] = {"id":cid, "names":names}
     progs = []
-    for pr in root.findall("programme"):
-        cid = pr.get("channel") or ""
-        st  = pr.get("start") or ""
-        en  = pr.get("stop") or ""
-        title = (pr.findtext("title") or "").strip()
-        desc  = (pr.findtext("desc") or "").strip()
-        progs.append({"channel":cid, "start":st, "stop":en, "title":title, "desc":desc})
+    for elem in iter_xmltv_elements(stream):
+        if elem.tag == "channel":
+            cid = elem.get("id") or ""
+            if wanted_ids and cid not in wanted_ids: continue
+            names = [child.text for child in elem if child.tag == "display-name" and child.text]
+            chmap[cid] = {"id":cid, "names":names}
+        else:
+            cid = elem.get("channel") or ""
+            if wanted_ids and cid not in wanted_ids: continue
+            st  = elem.get("start") or ""
+            en  = elem.get("stop") or ""
+            title = desc = None
+            for child in elem:  # first <title>/<desc> wins, like findtext()
+                tag = child.tag
+                if tag == "title":
+                    if title is None: title = child.text or ""
+                elif tag == "desc":
+                    if desc is None: desc = child.text or ""
+            title = (title or "").strip()
+            desc  = (desc or "").strip()
+            # local datetimes and the lowercased search haystack are computed once here;
+            # search/scheduling never re-parse start/stop or re-lower title/desc
+            progs.append({"channel":cid, "start":st, "stop":en, "title":title, "desc":desc,
+                          "start_dt":xmltv_to_local(st), "stop_dt":xmltv_to_local(en),
+                          "hay":f"{title} {desc}".lower()})
     return chmap, progs
 
+def iter_xmltv_elements(stream):
+    """Stream-parse XMLTV, yielding each finished <channel>/<programme> element.
+
+    The element (and everything before it) is released once the caller moves on, so big
+    feeds never hold the full DOM. Uses lxml's C iterparse when installed."""
+    if LET is not None:
+        # Like expat in the ElementTree fallback, never resolve external entities from a remote feed.
+        for _, elem in LET.iterparse(stream, events=("end",), tag=("channel","programme"),
+                                     resolve_entities=False, no_network=True):
+            yield elem
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+        return
+    context = ET.iterparse(stream, events=("start","end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event == "end" and elem.tag in ("channel","programme"):
+            yield elem
+            root.clear()
+
 def xmltv_to_local(ts):
     ts = ts.replace(" ","")
-    m = re.match(r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})([+\-]\d{4}|Z)?", ts)
+    m = _RE_XMLTS.match(ts)
     if not m: return None
     y,M,d,h,mi,s = map(int, m.groups()[:6]); tz = m.group(7)
     base = dt.datetime(y,M,d,h,mi,s)
@@ -176,6 +455,11 @@ def xmltv_to_local(ts):
 def fmt_bytes(n):
     return f"{n/1024/1024/1024:.2f} GB" if n>=1024**3 else f"{n/1024/1024:.1f} MB"
 
+def fmt_kbps(nbytes, seconds):
+    """Average kbit/s with one decimal, in integer arithmetic (called per ffmpeg progress block)."""
+    tenths = nbytes * 80 // (1000 * seconds)
+    return f"{tenths // 10}.{tenths % 10}"
+
 def fmt_hms(total_sec):
     s = max(0, int(total_sec))
     h = s // 3600
@@ -183,11 +467,31 @@ def fmt_hms(total_sec):
     ss = s % 60
     return f"{h:01d}:{m:02d}:{ss:02d}"
 
+# ------------------- subprocess helper -------------------
+def run_quiet(cmd, timeout=None, capture=False):
+    """Run cmd to completion; returns (returncode, stdout, stderr).
+
+    Never leave a child pipe undrained: ffmpeg/schtasks can fill a 64 KiB pipe and then
+    block forever. Without capture all three streams go to DEVNULL; with capture both
+    pipes are read concurrently by communicate() while we wait for the exit."""
+    if not capture:
+        proc = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, timeout=timeout)
+        return proc.returncode, "", ""
+    with subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, text=True) as proc:
+        try:
+            out, err = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill(); proc.communicate()
+            raise
+        return proc.returncode, out, err
+
 # ------------------- FFmpeg bootstrap -------------------
 def try_ffmpeg_in_path():
     try:
-        subprocess.run(["ffmpeg","-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return "ffmpeg"
+        rc, _, _ = run_quiet(["ffmpeg","-version"])
+        return "ffmpeg" if rc == 0 else None
     except Exception:
         return None
 
@@ -229,14 +533,22 @@ def install_ffmpeg_silently(status_callback=None):
         raise RuntimeError("No writable location for FFmpeg install.")
     say(f"Installing FFmpeg to {target_base} …")
     tmpdir = tempfile.mkdtemp(prefix="ffmzip_")
-    zpath = os.path.join(tmpdir, "ffmpeg-release-essentials.zip")
     url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
     say("Downloading FFmpeg…")
-    with urllib.request.urlopen(urllib.request.Request(url, headers={"User-Agent": UA}), timeout=180) as r:
-        with open(zpath, "wb") as f: shutil.copyfileobj(r, f)
-    say("Extracting…")
-    with zipfile.ZipFile(zpath, "r") as z:
-        z.extractall(tmpdir)
+    # Spool the zip in memory (spills to disk past 128 MiB) so it isn't written out and read back.
+    with tempfile.SpooledTemporaryFile(max_size=128 * 1024 * 1024) as spool:
+        if _HTTP is not None:
+            with _HTTP.get(url, timeout=180, stream=True) as r:
+                r.raise_for_status()
+                shutil.copyfileobj(r.raw, spool, length=1 << 20)
+        else:
+            with urllib.request.urlopen(urllib.request.Request(url, headers={"User-Agent": UA}), timeout=180) as r:
+                shutil.copyfileobj(r, spool, length=1 << 20)
+        spool.seek(0)
+        say("Extracting…")
+        with zipfile.ZipFile(spool, "r") as z:
+            # only the binaries; docs/presets are most of the archive and we never use them
+            z.extractall(tmpdir, members=[n for n in z.namelist() if n.endswith(("/bin/ffmpeg.exe", "/bin/ffprobe.exe"))])
     extracted_root = None
     for name in os.listdir(tmpdir):
         p = os.path.join(tmpdir, name)
@@ -268,10 +580,44 @@ def ensure_ffmpeg(status_callback=None):
     return install_ffmpeg_silently(status_callback=status_callback)
 
 # ------------------- threading helper -------------------
-class Worker(threading.Thread):
-    def __init__(self, fn, *args, done=None):
-        super().__init__(daemon=True)
+# Short UI-triggered jobs (loads, schtasks/PowerShell calls) share a few pooled threads
+# instead of spawning one each. Threads that live as long as a recording, or must not
+# queue behind a slow download (stop/abort), ask for a dedicated thread. All of them are
+# daemon threads, so closing the app never waits for an install, EPG load or PowerShell call.
+_IO_WORKERS = 4
+_IO_JOBS = queue.Queue()
+_IO_THREADS = []
+_IO_LOCK = threading.Lock()
+
+def _io_loop():
+    while True:
+        _IO_JOBS.get().run()
+
+def _io_submit(worker):
+    with _IO_LOCK:
+        if not _IO_THREADS:
+            for i in range(_IO_WORKERS):
+                t = threading.Thread(target=_io_loop, name=f"io_{i}", daemon=True)
+                t.start(); _IO_THREADS.append(t)
+    _IO_JOBS.put(worker)
+
+def _io_drop_pending():
+    """Forget queued jobs that have not started yet (used on app close)."""
+    while True:
+        try: _IO_JOBS.get_nowait()
+        except queue.Empty: return
+
+class Worker:
+    """Runs fn(*args) off the Tk thread. done(worker) runs on that same background thread
+    afterwards, so callers hop back to Tk with after(0, ...)."""
+    def __init__(self, fn, *args, done=None, dedicated=False):
         self.fn=fn; self.args=args; self.err=None; self.result=None; self.done=done
+        self.dedicated = dedicated
+    def start(self):
+        if self.dedicated:
+            threading.Thread(target=self.run, daemon=True).start()
+        else:
+            _io_submit(self)
     def run(self):
         try:
             self.result = self.fn(*self.args)
@@ -283,8 +629,10 @@ class Worker(threading.Thread):
                 except Exception: pass
 
 # ------------------- ffmpeg command builder -------------------
-def build_ffmpeg_cmd(ffmpeg, stream_url, out_path, duration_s, qopt, crash_safe=False):
-    base = [ffmpeg, "-hide_banner", "-loglevel", "info", "-stats",
+def build_ffmpeg_cmd(ffmpeg, stream_url, out_path, duration_s, qopt, crash_safe=False, progress=False):
+    # progress=True: machine-readable key=value progress on stdout instead of the stats line
+    stats = ["-nostats", "-progress", "pipe:1"] if progress else ["-stats"]
+    base = [ffmpeg, "-hide_banner", "-loglevel", "info", *stats,
             "-user_agent", UA,
             "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_at_eof", "1",
             "-i", stream_url, "-t", str(int(duration_s))]
@@ -309,7 +657,7 @@ def finalize_recording(ffmpeg_path, file_path):
     try:
         fixed_path = file_path + ".fixed.mp4"
         cmd = [ffmpeg_path or "ffmpeg", "-y", "-i", file_path, "-c", "copy", "-movflags", "+faststart", fixed_path]
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False, timeout=30)
+        run_quiet(cmd, timeout=30)
         if os.path.exists(fixed_path):
             os.replace(fixed_path, file_path)
     except Exception:
@@ -318,14 +666,113 @@ def finalize_recording(ffmpeg_path, file_path):
 # ------------------- schtasks helpers -------------------
 def run_schtasks(args, timeout=15):
     try:
-        proc = subprocess.run(args, capture_output=True, text=True, shell=False, timeout=timeout)
-        return proc.returncode, proc.stdout, proc.stderr
+        return run_quiet(args, timeout=timeout, capture=True)
     except subprocess.TimeoutExpired:
         return 124, "", "ERROR: schtasks timed out."
     except Exception as e:
         return 125, "", f"ERROR: {e}"
 
-def parse_schtasks_csv(csv_text):
+def ps_quote(s):
+    """PowerShell single-quoted string literal."""
+    return "'" + str(s).replace("'", "''") + "'"
+
+def run_powershell(script, timeout=30):
+    """One powershell.exe for a whole script; same (rc, out, err) contract as run_schtasks."""
+    return run_schtasks(["powershell", "-NoProfile", "-NonInteractive", "-Command", script], timeout=timeout)
+
+def unregister_tasks(names):
+    """Delete scheduled tasks with a single PowerShell process instead of one schtasks per name.
+    Returns (deleted_count, [(name, rc, message), ...]); None if PowerShell could not be run."""
+    if not names: return 0, []
+    script = ("foreach ($n in @(" + ",".join(ps_quote(n) for n in names) + ")) { "
+              "try { Unregister-ScheduledTask -TaskName (Split-Path $n -Leaf) -Confirm:$false -ErrorAction Stop; \"OK`t$n\" } "
+              "catch { \"FAIL`t$n`t$($_.Exception.Message)\" } }")
+    rc, out, err = run_powershell(script, timeout=5 + 2*len(names))
+    if rc == 125: return None
+    return ps_batch_results(names, rc, out, err)
+
+def ps_batch_results(names, rc, out, err):
+    """Collect the per-item "OK`tname" / "FAIL`tname`tmessage" lines our batch scripts print.
+    Names with no line at all (script died part-way) count as failures."""
+    done, failures = set(), []
+    for ln in out.splitlines():
+        parts = ln.rstrip().split("\t", 2)
+        if len(parts) >= 2 and parts[0] == "OK":
+            done.add(parts[1])
+        elif len(parts) >= 2 and parts[0] == "FAIL":
+            failures.append((parts[1], 1, parts[2] if len(parts) > 2 else ""))
+    seen = done | {f[0] for f in failures}
+    failures += [(n, rc or 1, (err or "no result from PowerShell").strip()) for n in names if n not in seen]
+    return len(done), failures
+
+def register_once_tasks(specs):
+    """Create one-shot tasks [(name, wrapper_path, start_datetime), ...] with a single PowerShell
+    Register-ScheduledTask loop. Returns (created_count, failures) like unregister_tasks;
+    None if PowerShell could not be run."""
+    if not specs: return 0, []
+    items = ",".join("@{N=%s;W=%s;A=%s}" % (ps_quote(n), ps_quote(w), ps_quote(at.strftime("%Y-%m-%dT%H:%M:%S")))
+                     for n, w, at in specs)
+    script = ("foreach ($t in @(" + items + ")) { "
+              "try { Register-ScheduledTask -TaskName $t.N -Action (New-ScheduledTaskAction -Execute $t.W) "
+              "-Trigger (New-ScheduledTaskTrigger -Once -At ([datetime]$t.A)) -Force -ErrorAction Stop | Out-Null; "
+              "\"OK`t$($t.N)\" } catch { \"FAIL`t$($t.N)`t$($_.Exception.Message)\" } }")
+    rc, out, err = run_powershell(script, timeout=10 + 2*len(specs))
+    if rc == 125: return None
+    return ps_batch_results([n for n, _, _ in specs], rc, out, err)
+
+_FFMPEG_CMD_RE = re.compile(r'-i\s+"?([^"\s]+)"?\s+-t\s+(\d+)\s.*\s("[^"]+"|\S+\.mp4)\s*$', re.I)
+
+def task_details_from_action(command, arguments=""):
+    """Recover stream url / duration / output path from a task action. Our tasks run a .cmd
+    wrapper, so the ffmpeg line is read from that file; otherwise the action itself is used."""
+    command = (command or "").strip().strip('"')
+    full = f'"{command}" {arguments or ""}'
+    if command.lower().endswith(".cmd") and os.path.isfile(command):
+        with open(command, encoding="utf-8", errors="replace") as f:
+            lines = [ln.strip() for ln in f if ln.strip() and not ln.lstrip().startswith("@")]
+        if lines: full = lines[-1]
+    m = _FFMPEG_CMD_RE.search(full)
+    if not m: return None
+    return {"stream_url": m.group(1), "duration_s": int(m.group(2)), "output_path": m.group(3).strip('"')}
+
+def task_action_from_xml(xml_text):
+    """(command, arguments) of the first Exec action in `schtasks /Query /XML` output.
+    Task XML lives in the Task Scheduler namespace, hence the {*} wildcard."""
+    if LET is not None:
+        # schtasks declares UTF-16 but we already hold decoded text; override the declaration.
+        root = LET.fromstring(xml_text.encode("utf-8"), LET.XMLParser(encoding="utf-8", remove_blank_text=True,
+                                                                            resolve_entities=False, no_network=True))
+    else:
+        root = ET.fromstring(xml_text)
+    command = root.findtext(".//{*}Command")
+    if command is None: raise ValueError("task has no Exec action")
+    return command, root.findtext(".//{*}Arguments") or ""
+
+def query_tasks_ps(prefix="IPTV_DVR"):
+    """Our tasks straight from Get-ScheduledTask, filtered by PowerShell and returned as compact
+    JSON: (raw_json, [{"N": name, "R": next run, "S": schedule, "T": state, "E": execute,
+    "A": arguments}, ...]). None if PowerShell is unavailable or fails, so callers can fall
+    back to schtasks."""
+    script = ("$l = @(Get-ScheduledTask -TaskName " + ps_quote(prefix + "*") + " -ErrorAction SilentlyContinue | "
+              "ForEach-Object { $i = $_ | Get-ScheduledTaskInfo; $a = @($_.Actions)[0]; $g = @($_.Triggers)[0]; "
+              "[pscustomobject]@{ N = $_.TaskName; "
+              "R = $(if ($i.NextRunTime) { $i.NextRunTime.ToString('yyyy-MM-dd HH:mm') } else { 'N/A' }); "
+              "S = $(if ($g) { $g.CimClass.CimClassName -replace '^MSFT_Task','' -replace 'Trigger$','' } else { '' }); "
+              "T = [string]$_.State; E = [string]$a.Execute; A = [string]$a.Arguments } }); "
+              "ConvertTo-Json -InputObject $l -Compress")
+    rc, out, err = run_powershell(script, timeout=30)
+    if rc != 0: return None
+    try:
+        items = json_loads(out.strip() or "[]")
+    except ValueError:
+        return None
+    if isinstance(items, dict): items = [items]
+    return out, [it for it in (items or []) if isinstance(it, dict) and it.get("N")]
+
+SCHTASKS_COLS = ("TaskName", "Next Run Time", "Schedule", "Status")
+
+def parse_schtasks_csv(csv_text, cols=SCHTASKS_COLS):
+    """schtasks /FO CSV output -> list of tuples holding only `cols` (stripped; "" if missing)."""
     rows = []
     try:
         if isinstance(csv_text, bytes):
@@ -333,17 +780,30 @@ def parse_schtasks_csv(csv_text):
                 csv_text = csv_text.decode("utf-16le")
             except Exception:
                 csv_text = csv_text.decode("utf-8", errors="replace")
-        f = StringIO(csv_text)
-        rdr = list(csv_reader(f))
-        if not rdr: return rows
-        headers = [h.strip() for h in rdr[0]]
-        for r in rdr[1:]:
-            if len(r) != len(headers): continue
-            rows.append({headers[i]: r[i] for i in range(len(headers))})
+        rdr = csv_reader(StringIO(csv_text))
+        header = next(rdr, None)
+        if not header: return rows
+        headers = [h.strip() for h in header]
+        idx = [headers.index(c) if c in headers else None for c in cols]
+        width = len(headers)
+        for r in rdr:
+            if len(r) != width or r == header: continue  # schtasks repeats the header per folder
+            rows.append(tuple(r[i].strip() if i is not None else "" for i in idx))
     except Exception:
         pass
     return rows
 
+# ------------------- Listbox helper -------------------
+def sync_listbox(lb, shown, rows):
+    """Make lb (currently showing `shown`) show `rows`, rewriting only what follows the
+    common prefix, with one batched insert instead of one Tcl call per row."""
+    n = 0
+    for a, b in zip(shown, rows):
+        if a != b: break
+        n += 1
+    if n < len(shown): lb.delete(n, tk.END)
+    if n < len(rows): lb.insert(tk.END, *rows[n:])
+
 # ------------------- Scrollable container -------------------
 class ScrollableFrame(ttk.Frame):
     def __init__(self, parent):
@@ -362,7 +822,10 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
     def _on_body_configure(self, _): self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     def _on_canvas_configure(self, event): self.canvas.itemconfigure(self.body_id, width=event.width)
-    def _on_mousewheel(self, event): self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def _on_mousewheel(self, event):
+        # Listbox/Text already scrolled themselves through their class binding; leave the page put.
+        if isinstance(event.widget, (tk.Listbox, tk.Text)): return
+        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
 # ------------------- GUI app -------------------
 class App(tk.Tk):
@@ -386,9 +849,27 @@ class App(tk.Tk):
         self.cfg = load_cfg(); ensure_dir(self.cfg["out_dir"])
         self.ffmpeg_path = None
         self.m3u_entries = []
+        self._name_to_entry = {}
+        self._picked_channel = None  # entry use_show_pick put at row 0 of chan_list
+        self._chan_token_index, self._chan_norm_index = {}, {}  # see build_chan_index
         self.chmap, self.progs = {}, []
+        self.epg_index = {}
+        self.progs_by_cid = {}  # channel id -> programme indices sorted by start
+        self.title_suggest = []  # [(title, bigrams, last stop)] for "did you mean"
+        self._epg_by_title_lc = {}  # lowercased exact title -> programme indices (quoted searches)
+        self._epg_candidates = lambda q: None
         self.epg_ready = False
+        self._playlist_loading = self._epg_loading = False
+        self._epg_after_playlist = True  # startup EPG load waits for the playlist's tvg-ids
+        self._epg_wanted = None  # tvg-id filter of the loaded (or loading) EPG
         self.tasks_index = []  # [(name, next_run, schedule, status)]
+        self._tasks_index_names = []  # task name per tasks_list row (empty while an error row is shown)
+        self._after_ids = {}  # debounce key -> pending after() id
+        self._preview_start_cache = (None, None)  # (inputs, start) for _preview_start_time
+        self._preview_suspended = False  # set while use_show_pick fills the form; it previews once at the end
+        self._shown_channels, self._shown_tasks = [], []  # rows currently in chan_list / tasks_list
+        self._tasks_raw_sig, self._tasks_cached = None, []
+        self._task_actions_cache = {}  # task name -> (execute, arguments) from the last listing
 
         self.scroll = ScrollableFrame(self)
         self.scroll.pack(fill="both", expand=True)
@@ -401,8 +882,7 @@ class App(tk.Tk):
         self.lift(); self.focus_force()
 
         self.bootstrap_ffmpeg()
-        self.load_playlist()
-        self.load_epg()
+        self.load_playlist()  # _after_playlist starts the first EPG load
         self.refresh_tasks_async()
 
     # --- Splash window ---
@@ -449,6 +929,7 @@ class App(tk.Tk):
         self.cfg["buf_end_min"] = self.buf_end_min.get()
         
         save_cfg(self.cfg)
+        _io_drop_pending()  # drop queued loads; running ones are daemon threads and die with the app
         self.destroy()
 
     def build_ui(self, root):
@@ -510,7 +991,8 @@ class App(tk.Tk):
         self.crash_safe_var = tk.BooleanVar(value=bool(self.cfg.get("crash_safe_mp4", False)))
         ttk.Checkbutton(outf, text="Crash-safe MP4 (fragmented)", variable=self.crash_safe_var).grid(row=1, column=2, sticky="w", padx=8)
 
-        self.preview_lbl = ttk.Label(outf, text="Will save as: …", style="Small.TLabel")
+        self.preview_var = tk.StringVar(value="Will save as: …")
+        self.preview_lbl = ttk.Label(outf, textvariable=self.preview_var, style="Small.TLabel")
         self.preview_lbl.grid(row=2, column=0, columnspan=3, sticky="w", padx=8, pady=(2,10))
 
         # Series Options (only lookahead)
@@ -529,6 +1011,7 @@ class App(tk.Tk):
         self.entry_show = ttk.Entry(showf, textvariable=self.show_var)
         self.entry_show.grid(row=0, column=1, sticky="ew", padx=(0,8), pady=(8,2))
         self.entry_show.bind("<Return>", lambda e: self.search_show())
+        self.entry_show.bind("<KeyRelease>", self._on_show_key)
         self.btn_find_epg = ttk.Button(showf, text="Find", command=self.search_show)
         self.btn_find_epg.grid(row=0, column=2, padx=(0,8), pady=(8,2))
         self.btn_clear_epg = ttk.Button(showf, text="Clear", command=self.clear_epg_search)
@@ -558,6 +1041,7 @@ class App(tk.Tk):
         self.entry_channel = ttk.Entry(manual, textvariable=self.search_var)
         self.entry_channel.grid(row=0, column=1, sticky="ew", padx=(0,8), pady=(8,2))
         self.entry_channel.bind("<Return>", lambda e: self.search_channels())
+        self.entry_channel.bind("<KeyRelease>", self._on_channel_key)
         self.btn_find_channel = ttk.Button(manual, text="Find", command=self.search_channels)
         self.btn_find_channel.grid(row=0, column=2, padx=(0,8), pady=(8,2))
         self.btn_clear_channel = ttk.Button(manual, text="Clear", command=self.clear_channel_search)
@@ -574,7 +1058,7 @@ class App(tk.Tk):
         self.chan_list.configure(yscrollcommand=sb2y.set, xscrollcommand=sb2x.set)
         sb2y.grid(row=0, column=1, sticky="ns")
         sb2x.grid(row=1, column=0, sticky="ew")
-        self.chan_list.bind("<<ListboxSelect>>", lambda e: self.update_output_preview())
+        self.chan_list.bind("<<ListboxSelect>>", lambda e: self.schedule_preview())
 
         ttk.Label(manual, text="Day (today / tomorrow / YYYY-MM-DD):").grid(row=1, column=0, sticky="e", padx=8)
         self.day_var = tk.StringVar(value="today")
@@ -597,15 +1081,15 @@ class App(tk.Tk):
         self.buf_end_min   = tk.IntVar(value=int(self.cfg.get("buf_end_min", 5)))
 
         ttk.Checkbutton(bufrow, text="Start buffer", variable=self.buf_start_var,
-                          command=self.update_output_preview).grid(row=0, column=0, sticky="w", padx=(0,6))
+                          command=self.schedule_preview).grid(row=0, column=0, sticky="w", padx=(0,6))
         tk.Spinbox(bufrow, from_=0, to=120, width=4, textvariable=self.buf_start_min,
-                       command=self.update_output_preview).grid(row=0, column=1, sticky="w")
+                       command=self.schedule_preview).grid(row=0, column=1, sticky="w")
         ttk.Label(bufrow, text="min").grid(row=0, column=2, sticky="w", padx=(4,16))
 
         ttk.Checkbutton(bufrow, text="End buffer", variable=self.buf_end_var,
-                          command=self.update_output_preview).grid(row=0, column=3, sticky="w", padx=(0,6))
+                          command=self.schedule_preview).grid(row=0, column=3, sticky="w", padx=(0,6))
         tk.Spinbox(bufrow, from_=0, to=120, width=4, textvariable=self.buf_end_min,
-                       command=self.update_output_preview).grid(row=0, column=4, sticky="w")
+                       command=self.schedule_preview).grid(row=0, column=4, sticky="w")
         ttk.Label(bufrow, text="min").grid(row=0, column=5, sticky="w")
 
         # Actions
@@ -615,7 +1099,8 @@ class App(tk.Tk):
         ttk.Button(actions, text="Series Record (schedule upcoming)", command=self.series_record_async).pack(side="left", padx=6)
         ttk.Button(actions, text="Exit", command=self.destroy).pack(side="right", padx=6)
 
-        self.status = ttk.Label(root, text="Initializing…", style="Small.TLabel")
+        self.status_var = tk.StringVar(value="Initializing…")
+        self.status = ttk.Label(root, textvariable=self.status_var, style="Small.TLabel")
         self.status.grid(row=6, column=0, columnspan=2, sticky="w", padx=16, pady=(0,6))
 
         # Scheduled Records panel (bottom)
@@ -642,9 +1127,32 @@ class App(tk.Tk):
         self._bind_preview_updates()
         self.update_output_preview()
 
+    def _debounce(self, key, delay_ms, fn):
+        """Run fn once, delay_ms after the last call with the same key (collapses keystroke bursts)."""
+        pending = self._after_ids.get(key)
+        if pending: self.after_cancel(pending)
+        def fire():
+            self._after_ids.pop(key, None)
+            fn()
+        self._after_ids[key] = self.after(delay_ms, fire)
+
+    def _on_channel_key(self, event):
+        if event.keysym in ("Return", "KP_Enter"): return
+        self._debounce("channel_search", 120, self.search_channels)
+
+    def _on_show_key(self, event):
+        if event.keysym in ("Return", "KP_Enter"): return
+        self._debounce("show_search", 120, lambda: self.epg_ready and self.search_show())
+
+    def schedule_preview(self):
+        # var traces/spinbox commands fire in bursts (typing, programmatic sets); one redraw per burst
+        if self._preview_suspended: return
+        self._debounce("preview", 60, self.update_output_preview)
+
     def _bind_preview_updates(self):
+        on_write = lambda *args: self.schedule_preview()
         for var in (self.outdir_var, self.filename_var, self.day_var, self.time_var, self.buf_start_min, self.buf_end_min):
-            try: var.trace_add("write", lambda *args: self.update_output_preview())
+            try: var.trace_add("write", on_write)
             except Exception: pass
 
     def _set_epg_controls_enabled(self, enabled: bool):
@@ -657,9 +1165,9 @@ class App(tk.Tk):
                 pass
 
     def _auto_filename(self, ch_name: str, start_at: dt.datetime) -> str:
-        safe = re.sub(r"[^A-Za-z0-9._-]+","_", ch_name)[:60]
+        safe = _RE_SAFE_FN.sub("_", ch_name)[:60]
         base = f"{safe}_{start_at.strftime('%Y-%m-%d_%H-%M')}.mp4"
-        return re.sub(r"\.+(?=\.mp4$)", "", base, flags=re.I)
+        return _RE_DOTS_MP4.sub("", base)
 
     def _current_channel_name(self) -> str:
         idx = self.chan_list.curselection()
@@ -667,14 +1175,24 @@ class App(tk.Tk):
         return self.chan_list.get(idx[0]) or "Recording"
 
     def _preview_start_time(self):
+        # Memoised on every input, including today's date for "today"/"tomorrow"; most
+        # preview refreshes come from vars that do not affect the start time.
+        try:
+            mins_raw = self.buf_start_min.get()
+        except Exception:  # IntVar.get() raises while the spinbox holds non-digits
+            mins_raw = None
+        key = (self.day_var.get(), self.time_var.get(), self.buf_start_var.get(), mins_raw, dt.date.today())
+        if self._preview_start_cache[0] == key:
+            return self._preview_start_cache[1]
         try:
             base = self._parse_when()
         except Exception:
-            return None
-        if self.buf_start_var.get():
-            try: mins = max(0, int(self.buf_start_min.get()))
+            base = None
+        if base is not None and self.buf_start_var.get():
+            try: mins = max(0, int(mins_raw))
             except Exception: mins = 0
             base = base - dt.timedelta(minutes=mins)
+        self._preview_start_cache = (key, base)
         return base
 
     def update_output_preview(self):
@@ -686,82 +1204,121 @@ class App(tk.Tk):
             fname = self._auto_filename(ch_name, start_at or dt.datetime.now())
         if not fname.lower().endswith(".mp4"): fname += ".mp4"
         path = os.path.join(out_dir, fname) if out_dir else fname
-        self.preview_lbl.configure(text=f"Will save as: {path}")
+        self.preview_var.set(f"Will save as: {path}")
 
     def bootstrap_ffmpeg(self):
-        self.status["text"] = "Checking FFmpeg…"
+        self.status_var.set("Checking FFmpeg…")
         def work():
             try:
-                return ensure_ffmpeg(status_callback=lambda msg: self.status.configure(text=msg))
+                return ensure_ffmpeg(status_callback=lambda msg: self.after(0, self.status_var.set, msg))
             except Exception as e:
                 return ("ERR", str(e))
-        w = Worker(work, done=self._after_ffmpeg); w.start()
+        w = Worker(work, done=lambda w: self.after(0, self._after_ffmpeg, w)); w.start()
 
     def _after_ffmpeg(self, w):
         if isinstance(w.result, tuple) and w.result and w.result[0] == "ERR":
-            self.status["text"] = f"FFmpeg setup failed: {w.result[1]}"
+            self.status_var.set(f"FFmpeg setup failed: {w.result[1]}")
         else:
             self.ffmpeg_path = w.result
-            self.status["text"] = f"FFmpeg ready: {self.ffmpeg_path}"
+            self.status_var.set(f"FFmpeg ready: {self.ffmpeg_path}")
 
     def load_playlist(self):
+        if self._playlist_loading: return
         url = self.m3u_var.get().strip()
-        self.status["text"] = "Loading playlist…"
+        self._playlist_loading = True
+        self.status_var.set("Loading playlist…")
         self.btn_reload_m3u.configure(state="disabled")
         def work():
             try:
-                return parse_m3u(fetch_text(url))
+                raw, enc = fetch_bytes(url)
+                if len(raw) >= M3U_BYTES_PARSE_MIN:
+                    return parse_m3u_bytes(raw, enc)
+                return parse_m3u(raw.decode(enc, errors="replace"))
             except Exception as e:
                 return ("ERR", str(e))
-        Worker(work, done=self._after_playlist).start()
+        Worker(work, done=lambda w: self.after(0, self._after_playlist, w)).start()
 
     def _after_playlist(self, w):
+        self._playlist_loading = False
         self.btn_reload_m3u.configure(state="normal")
         if isinstance(w.result, list):
             self.m3u_entries = w.result
-            self.status["text"] = f"Playlist loaded: {len(self.m3u_entries)} channels."
+            self._name_to_entry = {}
+            for e in self.m3u_entries:
+                self._name_to_entry.setdefault(e["name"], e)
+            self._chan_token_index, self._chan_norm_index = build_chan_index(self.m3u_entries)
+            self.status_var.set(f"Playlist loaded: {len(self.m3u_entries)} channels.")
             self.fill_channels(self.m3u_entries[:200])
         else:
-            self.status["text"] = f"Failed to load M3U: {w.result[1] if w.result else 'unknown error'}"
+            self.status_var.set(f"Failed to load M3U: {w.result[1] if w.result else 'unknown error'}")
+        if self._epg_after_playlist:
+            self._epg_after_playlist = False
+            self.load_epg()  # unfiltered if the playlist failed
+        elif self.epg_ready and self._playlist_tvg_ids() != self._epg_wanted:
+            self.load_epg()  # re-filter for the new playlist's channels (cheap with the 304 cache)
+
+    def _playlist_tvg_ids(self):
+        return {e["tvg_id"] for e in self.m3u_entries if e["tvg_id"]} or None
 
     def load_epg(self):
         url = self.epg_var.get().strip()
         if not url:
-            self.status["text"] = "EPG URL missing."
+            self.status_var.set("EPG URL missing.")
             return
-        self.status["text"] = "Loading EPG…"
+        if self._epg_loading: return
+        self._epg_loading = True
+        self.status_var.set("Loading EPG…")
         self.e_epg.configure(state="disabled")
         self.btn_reload_epg.configure(state="disabled")
+        self._epg_wanted = wanted = self._playlist_tvg_ids()
         def work():
             try:
-                return xmltv_load(url)
+                chmap, progs = xmltv_load(url, wanted)
+                return {"chmap": chmap, "progs": progs, "index": build_epg_index(progs),
+                        "by_cid": build_progs_by_cid(progs), "suggest": build_title_suggest(progs), "by_title": build_title_index(progs)}
             except Exception as e:
                 return ("ERR", str(e))
-        Worker(work, done=self._after_epg).start()
+        Worker(work, done=lambda w: self.after(0, self._after_epg, w)).start()
 
     def _after_epg(self, w):
+        self._epg_loading = False
         self.e_epg.configure(state="normal")
         self.btn_reload_epg.configure(state="normal")
-        if isinstance(w.result, tuple) and len(w.result)==2:
-            self.chmap, self.progs = w.result
-            self.status["text"] = f"EPG loaded: {len(self.chmap)} channels, {len(self.progs)} programmes."
+        if isinstance(w.result, dict):
+            r = w.result
+            self.chmap, self.progs, self.epg_index = r["chmap"], r["progs"], r["index"]
+            self.progs_by_cid, self.title_suggest = r["by_cid"], r["suggest"]
+            self._epg_by_title_lc = r["by_title"]
+            index, progs = self.epg_index, self.progs
+            self._epg_candidates = functools.lru_cache(maxsize=32)(lambda q: epg_candidates(index, progs, q))
+            self.status_var.set(f"EPG loaded: {len(self.chmap)} channels, {len(self.progs)} programmes.")
             self.epg_ready = True
             self._set_epg_controls_enabled(True)
+            if self._playlist_tvg_ids() != self._epg_wanted:
+                self.load_epg()  # the playlist changed while this load was running
         else:
-            self.status["text"] = f"Failed to load EPG: {w.result[1] if w.result else 'unknown error'}"
+            self.status_var.set(f"Failed to load EPG: {w.result[1] if w.result else 'unknown error'}")
             self.epg_ready = False
             self._set_epg_controls_enabled(False)
 
+    def progs_for_channel(self, cid):
+        """Programmes of one EPG channel, in start order (via the progs_by_cid index)."""
+        return [self.progs[i] for i in self.progs_by_cid.get(cid, ())]
+
     def pick_folder(self):
         d = filedialog.askdirectory(initialdir=self.outdir_var.get())
         if d:
             self.outdir_var.set(d)
 
     def fill_channels(self, entries):
-        self.chan_list.delete(0, tk.END)
-        for e in entries:
-            self.chan_list.insert(tk.END, e['name'])
-        self.update_output_preview()
+        names = [e["name"] for e in entries]
+        if names == self._shown_channels: return
+        before = self._current_channel_name()
+        sync_listbox(self.chan_list, self._shown_channels, names)
+        self._shown_channels = names
+        self._picked_channel = None
+        if self._current_channel_name() != before:
+            self.schedule_preview()
 
     def clear_channel_search(self):
         self.search_var.set("")
@@ -771,11 +1328,7 @@ class App(tk.Tk):
         q = self.search_var.get().strip()
         if not q:
             self.fill_channels(self.m3u_entries[:200]); return
-        scored = []
-        for e in self.m3u_entries:
-            hay = f"{e['name']} {e['tvg_id']} {e['group']} {e['ext']}"
-            s = tokenscore(hay, q)
-            if s>0: scored.append((s,e))
+        scored = score_all(self.m3u_entries, q)
         scored.sort(key=lambda x:x[0], reverse=True)
         self.fill_channels([e for _,e in scored[:200]])
 
@@ -783,8 +1336,10 @@ class App(tk.Tk):
         idx = self.chan_list.curselection()
         if not idx: return None
         visible_name = self.chan_list.get(idx[0])
-        for e in self.m3u_entries:
-            if e["name"] == visible_name: return e
+        p = self._picked_channel  # use_show_pick's match wins over a same-named entry
+        if p is not None and idx[0] == 0 and p["name"] == visible_name: return p
+        e = self._name_to_entry.get(visible_name)
+        if e is not None: return e
         for e in self.m3u_entries:
             if e["name"].startswith(visible_name): return e
         return None
@@ -801,9 +1356,10 @@ class App(tk.Tk):
         if not q: return
         lookahead_days = max(1, int(self.series_days_var.get()))
         cutoff = dt.datetime.now() + dt.timedelta(days=lookahead_days)
-        rows = epg_search_rows(self.progs, self.chmap, q, cutoff_dt=cutoff)
+        rows = epg_search_rows(self.progs, self.chmap, q, cutoff_dt=cutoff,
+                               candidates=self._epg_candidates(q), by_title=self._epg_by_title_lc)
         if not rows:
-            suggestions = epg_title_suggestions(self.progs, q, k=8)
+            suggestions = epg_title_suggestions(self.title_suggest, q.strip('"'), k=8)
             if suggestions:
                 self.show_list.insert(tk.END, "No exact matches. Try:")
                 for s in suggestions:
@@ -819,9 +1375,9 @@ class App(tk.Tk):
             if not self.show_list.curselection():
                 return
             row = self.show_list.get(self.show_list.curselection()[0]).strip()
-            m = re.match(r"^>>\s+(.+)$", row)
+            m = _RE_SUGGEST.match(row)
             if m:
-                self.show_var.set(m.group(1))
+                self.show_var.set(f'"{m.group(1)}"')  # a suggestion is a real title: look it up exactly
                 self.search_show()
                 return
             self.use_show_pick()
@@ -829,9 +1385,6 @@ class App(tk.Tk):
             messagebox.showwarning(APP_TITLE, f"Could not use the selected show.\n\nReason: {e}")
 
     def use_show_pick(self):
-        def _norm(s: str) -> str:
-            return re.sub(r'[^a-z0-9]+', '', (s or '').lower())
-
         idx = self.show_list.curselection()
         if not idx:
             messagebox.showwarning(APP_TITLE, "Select a show first.")
@@ -841,6 +1394,7 @@ class App(tk.Tk):
         if not row or row.startswith("No exact") or row.startswith("Try") or row.startswith(">>"):
             return
 
+        self._preview_suspended = True  # the var sets below would each schedule a preview
         try:
             parts = [p.strip() for p in row.split("|")]
             if len(parts) < 3:
@@ -859,49 +1413,58 @@ class App(tk.Tk):
             self.time_var.set(time_part)
 
             best, best_s = None, -1
-            ch_norm = _norm(chname)
-            for e in self.m3u_entries:
-                s = tokenscore(e["name"], chname)
+            ch_norm = norm_key(chname)
+            ch_lc = chname.lower().strip()
+            # Only entries containing a name token or sharing a normalised key can score;
+            # with none of those, scan everything so the no-match pick stays the same.
+            cand = chan_candidates(self._chan_token_index, self._chan_norm_index, ch_lc, ch_norm)
+            entries = self.m3u_entries
+            scored = []  # (score, entry) for the runners-up shown under the pick
+            for e in ([entries[i] for i in sorted(cand)] if cand else entries):
+                s = tokenscore(e["name"].lower(), ch_lc, lowered=True)
                 if e["name"] == chname:
                     s += 100
-                elif _norm(e["name"]) == ch_norm:
+                elif e["norm_name"] == ch_norm:
                     s += 70
-                elif e.get("tvg_id") and _norm(e["tvg_id"]) == ch_norm:
+                elif e["norm_tvg"] and e["norm_tvg"] == ch_norm:
                     s += 50
+                if s > 0: scored.append((s, e))
                 if s > best_s:
                     best_s, best = s, e
 
             if best:
+                # Show the pick on top of its runners-up (stable sort keeps playlist order on ties)
+                # instead of re-running search_channels and hunting for the row.
+                scored.sort(key=lambda x: x[0], reverse=True)
                 self.search_var.set(chname)
-                self.search_channels()
-                for i in range(self.chan_list.size()):
-                    if self.chan_list.get(i) == best["name"]:
-                        self.chan_list.selection_clear(0, tk.END)
-                        self.chan_list.selection_set(i)
-                        self.chan_list.see(i)
-                        break
-
-            m = re.fullmatch(r"(\d{2}):(\d{2})", end_str.split()[0])
+                self.fill_channels([best] + [e for _, e in scored if e is not best][:199])
+                self._picked_channel = best
+                self.chan_list.selection_clear(0, tk.END)
+                self.chan_list.selection_set(0)
+                self.chan_list.see(0)
+
+            m = _RE_HHMM.fullmatch(end_str.split()[0])
             if m:
                 eh, em = int(m.group(1)), int(m.group(2))
-                start_dt = dt.datetime.strptime(start_str, "%Y-%m-%d %H:%M")
+                start_dt = fastparse_ymdhm(start_str)
                 end_dt = start_dt.replace(hour=eh, minute=em)
                 if end_dt < start_dt:
                     end_dt += dt.timedelta(days=1)
                 dur = int((end_dt - start_dt).total_seconds())
                 self.dur_var.set(f"{dur//3600:02d}:{(dur%3600)//60:02d}:{dur%60:02d}")
-
-            self.update_output_preview()
         except Exception as e:
             messagebox.showwarning(APP_TITLE, f"Could not use the selected show.\n\nReason: {e}")
+        finally:
+            self._preview_suspended = False
+            self.update_output_preview()
 
     def _parse_when(self):
         day = self.day_var.get().strip().lower()
         now = dt.datetime.now()
         if day in ("","today"): base = now
         elif day == "tomorrow": base = now + dt.timedelta(days=1)
-        else: base = dt.datetime.strptime(day, "%Y-%m-%d")
-        m = re.fullmatch(r"(\d{1,2}):(\d{2})(?:\s*(am|pm))?", self.time_var.get().strip().lower())
+        else: base = fastparse_ymd(day)
+        m = _RE_CLOCK.fullmatch(self.time_var.get().strip().lower())
         if not m: raise ValueError("Time examples: 20:00 or 8:00 pm")
         hh,mm = int(m.group(1)), int(m.group(2)); ap=m.group(3)
         if ap == "pm" and hh!=12: hh+=12
@@ -981,7 +1544,7 @@ class App(tk.Tk):
         if not base_name.lower().endswith(".mp4"): base_name += ".mp4"
         out_path = os.path.join(out_dir, base_name)
         cmd = build_ffmpeg_cmd(self.ffmpeg_path, ch["url"], out_path, dur_s, QUALITY_OPTS[self.quality_var.get()], crash_safe=bool(self.crash_safe_var.get()))
-        task_name = f"IPTV_DVR_{re.sub(r'[^A-Za-z0-9_-]+','_', base_name)}"
+        task_name = f"IPTV_DVR_{_RE_TASK_SAFE.sub('_', base_name)}"
         wrapper = self._write_task_wrapper(cmd, task_name)
         run_date = start_at.strftime("%m/%d/%Y")
         run_time = start_at.strftime("%H:%M")
@@ -996,9 +1559,84 @@ class App(tk.Tk):
             return (True, f"{'Scheduled weekly' if recurring else 'Scheduled one-time'}.\nTask: {task_name}\nTime: {run_time}  Date: {run_date}")
         return (False, f"Task creation failed (rc={rc}):\n{out}\n{err}")
 
+    def _series_record(self):
+        """Schedule every upcoming airing of the searched show on the selected channel (within the
+        lookahead window) as one-time tasks named SERIES_PREFIX + show + _YYYYMMDD_HHMM."""
+        if not self.ffmpeg_path:
+            return (False, "FFmpeg not ready yet.")
+        if not self.epg_ready:
+            return (False, "EPG not loaded yet.")
+        ch = self.get_selected_channel()
+        if not ch:
+            return (False, "Pick a channel first.")
+        if not ch.get("tvg_id") or ch["tvg_id"] not in self.progs_by_cid:
+            return (False, "The selected channel has no EPG data (missing or unknown tvg-id).")
+        title_q = self.show_var.get().strip().lower()
+        if not title_q:
+            return (False, "Enter a show title first.")
+        exact = quoted_title(title_q)  # a quoted title (e.g. a clicked suggestion) must match exactly
+        now = dt.datetime.now()
+        cutoff = now + dt.timedelta(days=max(1, int(self.series_days_var.get())))
+        pre = max(0, int(self.buf_start_min.get())) if self.buf_start_var.get() else 0
+        post = max(0, int(self.buf_end_min.get())) if self.buf_end_var.get() else 0
+        out_dir = (self.outdir_var.get().strip() or self.cfg["out_dir"]); ensure_dir(out_dir)
+        qopt = QUALITY_OPTS[self.quality_var.get()]
+        crash_safe = bool(self.crash_safe_var.get())
+
+        airings = [p for p in self.progs_for_channel(ch["tvg_id"])
+                   if p["start_dt"] and p["stop_dt"] and now < p["start_dt"] <= cutoff
+                   and (p["title"].strip().lower() == exact if exact is not None else title_q in p["title"].lower())]
+        if not airings:
+            return (False, f"No upcoming airings of '{self.show_var.get().strip()}' on {ch['name']}.")
+        # A loose query ("news") can hit several shows; keep the first one's airings only,
+        # since the task names are built from its title.
+        title = airings[0]["title"].strip()
+        airings = [p for p in airings if p["title"].strip().lower() == title.lower()]
+        show = _RE_TASK_SAFE.sub("_", title).strip("_")[:40] or "Show"
+        # A -Once task whose start time has passed never fires: start those at the next minute
+        # that is still safely ahead and trim the duration to match.
+        soonest = (now + dt.timedelta(minutes=2)).replace(second=0, microsecond=0)
+        specs, clamped, skipped = [], [], []
+        for p in airings:
+            st = p["start_dt"]
+            start_at = st - dt.timedelta(minutes=pre)
+            end_at = p["stop_dt"] + dt.timedelta(minutes=post)
+            if end_at <= soonest:
+                skipped.append(st.strftime("%a %d %b %H:%M")); continue  # over before a task could fire
+            if start_at < soonest:
+                start_at = soonest
+                clamped.append(st.strftime("%a %d %b %H:%M"))
+            dur_s = int((end_at - start_at).total_seconds())
+            out_path = os.path.join(out_dir, self._auto_filename(f"{ch['name']}_{show}", st))
+            task_name = f"{self.SERIES_PREFIX}{show}_{st.strftime('%Y%m%d_%H%M')}"
+            cmd = build_ffmpeg_cmd(self.ffmpeg_path, ch["url"], out_path, dur_s, qopt, crash_safe=crash_safe)
+            specs.append((task_name, self._write_task_wrapper(cmd, task_name), start_at))
+
+        if not specs:
+            return (False, f"The upcoming airings of {title} on {ch['name']} start too soon to schedule.")
+        res = register_once_tasks(specs)
+        if res is None:  # no PowerShell: one schtasks per airing
+            created, failures = 0, []
+            for task_name, wrapper, start_at in specs:
+                rc, out, err = run_schtasks(["schtasks","/Create","/SC","ONCE","/TN",task_name,"/TR",wrapper,
+                                             "/ST",start_at.strftime("%H:%M"),"/SD",start_at.strftime("%m/%d/%Y"),"/F"], timeout=20)
+                if rc == 0: created += 1
+                else: failures.append((task_name, rc, err or out))
+        else:
+            created, failures = res
+        msg = f"Scheduled {created} of {len(specs)} airing(s) of {title} on {ch['name']}."
+        if clamped:
+            msg += "\n\nStarts too soon for the full start buffer, recording from " + \
+                   f"{soonest.strftime('%H:%M')} instead: " + ", ".join(clamped)
+        if skipped:
+            msg += "\n\nSkipped (ends before a task could start): " + ", ".join(skipped)
+        if failures:
+            msg += "\n\n" + "\n".join(f"- {nm} (rc={rc}) {e}" for nm, rc, e in failures[:8])
+        return (created > 0, msg)
+
     def series_record_async(self):
         Worker(self._series_record, done=lambda w: self.after(0, self._series_done, w)).start()
-        self.status["text"] = "Scheduling series… (running in background)"
+        self.status_var.set("Scheduling series… (running in background)")
 
     def _series_done(self, w):
         if isinstance(w.result, tuple):
@@ -1010,50 +1648,64 @@ class App(tk.Tk):
                 messagebox.showerror(APP_TITLE, msg)
         else:
             messagebox.showerror(APP_TITLE, "Series scheduling failed (unknown error).")
-        self.status["text"] = "Ready."
+        self.status_var.set("Ready.")
 
     def refresh_tasks_async(self):
         Worker(self._query_tasks, done=lambda w: self.after(0, self._show_tasks, w)).start()
 
     def _query_tasks(self):
-        rc, out, err = run_schtasks(["schtasks","/Query","/FO","CSV","/V"], timeout=25)
-        if rc != 0: return (False, f"Query failed (rc={rc}): {err or out}")
-        rows = parse_schtasks_csv(out)
-        ours = []
-        for r in rows:
-            name = (r.get("TaskName") or r.get("TaskName ") or "").strip()
-            if not name: continue
-            if "IPTV_DVR" in name:
-                next_run = (r.get("Next Run Time") or r.get("Next Run Time " ) or "").strip()
-                schedule = (r.get("Schedule") or r.get("Schedule ") or "").strip()
-                status = (r.get("Status") or r.get("Status ") or "").strip()
-                ours.append((name, next_run, schedule, status))
+        # Preferred: PowerShell filters to our tasks and hands back small JSON (actions included).
+        ps = query_tasks_ps()
+        if ps is not None:
+            out, items = ps
+        else:
+            rc, out, err = run_schtasks(["schtasks","/Query","/FO","CSV","/V"], timeout=25)
+            if rc != 0: return (False, f"Query failed (rc={rc}): {err or out}")
+        # Skip the parse (and the action snapshot) when the listing is byte-for-byte unchanged.
+        sig = hashlib.blake2b(out.encode("utf-8", "replace"), digest_size=16).digest()
+        if sig == self._tasks_raw_sig:
+            return (True, self._tasks_cached)
+        if ps is not None:
+            ours = [(it["N"], it.get("R") or "", it.get("S") or "", it.get("T") or "") for it in items]
+            actions = {it["N"]: (it.get("E") or "", it.get("A") or "") for it in items}
+        else:
+            # schtasks reports root-folder tasks as "\Name"; keep the bare name used everywhere else.
+            ours = [(row[0].lstrip("\\"),) + row[1:] for row in parse_schtasks_csv(out) if "IPTV_DVR" in row[0]]
+            # PowerShell just failed; don't start it again for actions. _get_task_details
+            # falls back to a live schtasks /XML query for each task instead.
+            actions = {}
         ours.sort()
+        self._tasks_raw_sig, self._tasks_cached = sig, ours
+        # Keep every task's action so double-click needs no subprocess of its own. The .cmd
+        # wrapper is read only then: re-creating a task rewrites it without changing the listing.
+        self._task_actions_cache = actions
         return (True, ours)
 
     def _show_tasks(self, w):
-        self.tasks_list.delete(0, tk.END)
-        self.series_info.delete(0, tk.END)
         if isinstance(w.result, tuple) and w.result and w.result[0]:
-            self.tasks_index = list(w.result[1])
-            for name, nxt, sched, status in self.tasks_index:
-                self.tasks_list.insert(tk.END, f"{name}    |    Next: {nxt}    |    {sched}    |    {status}")
+            tasks = w.result[1]
+            if tasks is self.tasks_index and self._tasks_index_names:
+                return  # _query_tasks handed back its cached snapshot: nothing to redraw
+            self.tasks_index = tasks
+            self._tasks_index_names = [t[0] for t in tasks]
+            rows = [f"{name}    |    Next: {nxt}    |    {sched}    |    {status}" for name, nxt, sched, status in tasks]
         else:
             self.tasks_index = []
+            self._tasks_index_names = []
             error_message = w.result[1] if isinstance(w.result, tuple) and len(w.result) > 1 else "Unable to read scheduled tasks. Try Refresh."
-            self.tasks_list.insert(tk.END, error_message)
+            rows = [error_message]
+        sync_listbox(self.tasks_list, self._shown_tasks, rows)
+        self._shown_tasks = rows
+        self.on_task_select()  # unchanged rows keep their selection; refresh its series pane
 
     def _get_selected_task_names(self):
-        names = []
-        for idx in self.tasks_list.curselection():
-            line = self.tasks_list.get(idx)
-            names.append(line.split("    |", 1)[0].strip())
-        return names
+        names = self._tasks_index_names
+        return [names[i] for i in self.tasks_list.curselection() if i < len(names)]
 
     def on_task_double_click(self, event):
-        idx = self.tasks_list.curselection()
-        if not idx: return
-        task_name = self.tasks_list.get(idx[0]).split("    |")[0].strip()
+        names = self._get_selected_task_names()
+        if not names: return
+        task_name = names[0]
         
         def _get_task_details_done(w):
             if w.result and w.result[0]:
@@ -1063,23 +1715,22 @@ class App(tk.Tk):
         Worker(self._get_task_details, task_name, done=lambda w: self.after(0, _get_task_details_done, w)).start()
     
     def _get_task_details(self, task_name):
+        action = self._task_actions_cache.get(task_name.rsplit("\\", 1)[-1])
+        if action:
+            try:
+                task_details = task_details_from_action(*action)
+            except OSError:
+                task_details = None
+            if task_details:
+                return (True, task_details)
         rc, out, err = run_schtasks(["schtasks", "/Query", "/TN", task_name, "/XML"], timeout=20)
         if rc != 0:
             return (False, f"Error fetching task details (rc={rc}):\n{err or out}")
         try:
-            root = ET.fromstring(out)
-            task_details = {}
-            command = root.find(".//Command").text
-            arguments = root.find(".//Arguments").text if root.find(".//Arguments") is not None else ""
-            full_command = f'"{command}" {arguments}'
-            
-            m = re.search(r'-i\s+"([^"]+)"\s+-t\s+(\d+)\s+.*"([^"]+)"', full_command)
-            if not m:
+            command, arguments = task_action_from_xml(out)
+            task_details = task_details_from_action(command, arguments)
+            if not task_details:
                 return (False, "Could not parse FFmpeg command from task wrapper.")
-
-            task_details["stream_url"] = m.group(1)
-            task_details["duration_s"] = int(m.group(2))
-            task_details["output_path"] = m.group(3)
             return (True, task_details)
         except Exception as e:
             return (False, f"Error parsing XML: {e}")
@@ -1107,13 +1758,17 @@ class App(tk.Tk):
         Worker(self._delete_tasks_batch, names, done=lambda w: self.after(0, self._after_delete_tasks, w)).start()
 
     def _delete_tasks_batch(self, names):
-        successes, failures = 0, []
-        for nm in names:
-            rc, out, err = run_schtasks(["schtasks","/Delete","/TN",nm,"/F"], timeout=20)
-            if rc == 0:
-                successes += 1
-            else:
-                failures.append((nm, rc, err or out))
+        res = unregister_tasks(names)
+        if res is not None:
+            successes, failures = res
+        else:  # no PowerShell: one schtasks per task
+            successes, failures = 0, []
+            for nm in names:
+                rc, out, err = run_schtasks(["schtasks","/Delete","/TN",nm,"/F"], timeout=20)
+                if rc == 0:
+                    successes += 1
+                else:
+                    failures.append((nm, rc, err or out))
         msg = f"Deleted {successes} task(s)."
         if failures:
             msg += f"  {len(failures)} failed."
@@ -1128,6 +1783,7 @@ class App(tk.Tk):
             detail = "\n".join(f"- {nm} (rc={rc}) {err}" for nm,rc,err in failures[:8])
             messagebox.showerror(APP_TITLE, f"{msg}\n\n{detail}")
 
+    SERIES_PREFIX = "IPTV_DVR_SERIES_"
     SERIES_RE = re.compile(r"^(IPTV_DVR_SERIES_.+?)_\d{8}_\d{4,6}$")
     def _series_group_key(self, task_name: str):
         m = self.SERIES_RE.match(task_name)
@@ -1135,32 +1791,122 @@ class App(tk.Tk):
         return None
 
 # --- FIX: ADDED MISSING EPG HELPER FUNCTIONS ---
-def epg_search_rows(progs, chmap, query, cutoff_dt=None):
+def build_epg_index(progs):
+    """Inverted index: lowercased word of title/desc -> sorted array of programme indices."""
+    index = {}
+    for i, p in enumerate(progs):
+        for w in set(_RE_WORD.findall(p["hay"])):
+            index.setdefault(w, []).append(i)
+    return {w: array("i", ids) for w, ids in index.items()}
+
+def build_progs_by_cid(progs):
+    """channel id -> programme indices, each list sorted by local start time."""
+    by_cid = {}
+    for i, p in enumerate(progs):
+        by_cid.setdefault(p["channel"], []).append(i)
+    far = dt.datetime.max
+    for ids in by_cid.values():
+        ids.sort(key=lambda i: progs[i]["start_dt"] or far)
+    return by_cid
+
+def epg_candidates(index, progs, query):
+    """Programme indices whose title/desc contain every query token (substring match, like
+    epg_search_rows). Only the longest (most selective) token goes through the index, by
+    scanning its vocabulary; survivors are checked for the other tokens against their hay.
+    Returns None when the caller must fall back to a full scan (non-word or 1-char query)."""
+    toks = query.lower().split()
+    if not toks or not all(_RE_WORD.fullmatch(t) for t in toks): return None
+    lead = max(toks, key=len)
+    if len(lead) < 2: return None
+    hits = set()
+    for w, ids in index.items():
+        if lead in w: hits.update(ids)
+    rest = [t for t in toks if t != lead]
+    if rest:
+        hits = {i for i in hits if all(t in progs[i]["hay"] for t in rest)}
+    return frozenset(hits)
+
+def build_title_index(progs):
+    """lowercased exact title -> array of programme indices, for quoted (exact-title) searches."""
+    by_title = {}
+    for i, p in enumerate(progs):
+        if p["title"]: by_title.setdefault(p["title"].strip().lower(), []).append(i)
+    return {t: array("i", ids) for t, ids in by_title.items()}
+
+def quoted_title(query):
+    """'"Some Title"' -> 'some title'; None if the query is not a quoted phrase."""
+    q = query.strip()
+    if len(q) >= 2 and q[0] == q[-1] == '"':
+        return q[1:-1].strip().lower()
+    return None
+
+def epg_search_rows(progs, chmap, query, cutoff_dt=None, candidates=None, by_title=None):
+    """A quoted query with by_title given is an exact title lookup; otherwise every query
+    token must appear in title/desc."""
+    exact = quoted_title(query) if by_title is not None else None
+    if exact is not None:
+        candidates = by_title.get(exact, ())
     now = dt.datetime.now()
     ql = query.lower().split()
     rows = []
-    for p in progs:
-        hay = f"{p['title']} {p['desc']}".lower()
-        if all(t in hay for t in ql):
-            st = xmltv_to_local(p["start"]); en = xmltv_to_local(p["stop"])
-            if not st or not en: continue
-            if en <= now: continue
-            if cutoff_dt and st > cutoff_dt: continue
-            chname = chmap.get(p["channel"],{}).get("names",[p["channel"]])[0]
-            rows.append(f"{st.strftime('%Y-%m-%d %H:%M')} - {en.strftime('%H:%M')} | {chname} | {p['title']}")
-            if len(rows) >= 400: break
+    # candidates (from epg_candidates) are already known to match every token
+    pool = progs if candidates is None else (progs[i] for i in sorted(candidates))
+    for p in pool:
+        st = p["start_dt"]; en = p["stop_dt"]
+        if not st or not en: continue
+        if en <= now: continue
+        if cutoff_dt and st > cutoff_dt: continue
+        if candidates is None:
+            hay = p["hay"]
+            if not all(t in hay for t in ql): continue
+        chname = chmap.get(p["channel"],{}).get("names",[p["channel"]])[0]
+        rows.append(f"{st.strftime('%Y-%m-%d %H:%M')} - {en.strftime('%H:%M')} | {chname} | {p['title']}")
+        if len(rows) >= 400: break
     rows.sort()
     return rows
 
-def epg_title_suggestions(progs, query, k=8):
+def title_bigrams(s):
+    s = s.lower()
+    return frozenset(s[i:i+2] for i in range(len(s)-1))
+
+def build_title_suggest(progs):
+    """Deduped titles as (title, lowercase bigrams, latest stop) for epg_title_suggestions."""
+    last = {}
+    for p in progs:
+        t = p["title"]; en = p["stop_dt"]
+        if t and en and (t not in last or en > last[t]): last[t] = en
+    return [(t, title_bigrams(t), en) for t, en in last.items()]
+
+_SUGG_LIVE = {}  # minute bucket -> (suggest list it was built from, [(title, bigrams)] still airing)
+
+def live_titles(suggest):
+    """Titles from build_title_suggest that have not finished airing, recomputed at most once
+    a minute per suggest list (a title may linger up to a minute past its last showing)."""
+    bucket = int(time.time()) // 60
+    hit = _SUGG_LIVE.get(bucket)
+    if hit is not None and hit[0] is suggest:
+        return hit[1]
     now = dt.datetime.now()
-    future_titles = {
-        (p["title"] or "").strip()
-        for p in progs
-        if p.get("title") and xmltv_to_local(p["stop"]) and xmltv_to_local(p["stop"]) > now
-    }
-    future_titles = [t for t in future_titles if t]
-    return get_close_matches(query, future_titles, n=k, cutoff=0.6)
+    live = [(t, b) for t, b, en in suggest if en > now]
+    _SUGG_LIVE.clear()
+    _SUGG_LIVE[bucket] = (suggest, live)
+    return live
+
+def epg_title_suggestions(suggest, query, k=8, pool=100):
+    """Two-stage "did you mean": rank future titles by bigram Dice overlap with the query
+    (cheap set ops), then run the edit-distance ratio only on the best `pool` of them."""
+    live = live_titles(suggest)
+    qb = title_bigrams(query)
+    if qb:
+        nq = len(qb)
+        dice = ((2 * len(qb & b) / (nq + len(b)), t) for t, b in live if not qb.isdisjoint(b))
+        cands = [t for _, t in heapq.nlargest(pool, dice)]
+    else:
+        cands = [t for t, _ in live]
+    if lev_ratio is None:
+        return get_close_matches(query, cands, n=k, cutoff=0.6)
+    best = heapq.nlargest(k, ((lev_ratio(query, t), t) for t in cands))
+    return [t for s, t in best if s >= 0.6]
 
 # ----- Task Details / Recording window -----
 class WaitRecord(tk.Toplevel):
@@ -1230,16 +1976,30 @@ class WaitRecord(tk.Toplevel):
 
 # ----- Live Recording window (similar to original WaitRecord) -----
 class WaitRecordLive(tk.Toplevel):
+    LOG_MAX_LINES = 2000
+    LOG_TRIM_SLACK = 200
     def __init__(self, master, ffmpeg, stream, out_file, start_at, dur_s, qopt, crash_safe=False):
         super().__init__(master)
         self.title("Recording Session")
         self.geometry("1000x640")
         self.configure(bg=CARD_BG)
         self.ffmpeg=ffmpeg; self.stream=stream; self.out=out_file
+        self._out_dir = os.path.dirname(os.path.abspath(out_file)) or "."
         self.start_at=start_at; self.dur_s=dur_s; self.qopt=qopt
         self.crash_safe = crash_safe
         self.proc=None; self.stop=False
         self.elapsed = 0
+        self._last_kbps = self._last_fps = "-"  # what stats_line currently shows
+        # The recording thread only updates this state; _flush_ui copies it into the widgets
+        # on the Tk thread at most five times a second.
+        self._pending_log = deque()
+        self._log_lines = 0  # newline-terminated lines currently in self.log
+        self._pb_value = 0
+        self._status_text = "Waiting…"
+        self._finished = False
+        self._dirty = False
+        self._last_elapsed_shown = -1
+        self._kbps_from_size = False  # last -progress block had bitrate=N/A
         self.protocol("WM_DELETE_WINDOW", self.on_close_window)
 
         ttk.Label(self, text="Armed & Recording", style="Header.TLabel").pack(pady=8)
@@ -1260,97 +2020,162 @@ class WaitRecordLive(tk.Toplevel):
         self.open_folder_btn = ttk.Button(btns, text="Open Folder", command=self.open_folder, state="disabled")
         self.open_folder_btn.pack(side="left", padx=6)
 
-        Worker(self._run).start()
-
-    def _log(self, s): self.log.insert(tk.END, s+"\n"); self.log.see(tk.END)
-
-    def _update_stats_from_line(self, line: str):
-        m = re.search(r"time=(\d+):(\d+):(\d+)", line)
-        if m:
-            h,mn,sc = map(int, m.groups())
-            self.elapsed = h*3600 + mn*60 + sc
-        fps = None; kbps = None
-        m = re.search(r"fps=\s*([0-9.]+)", line);        fps = m.group(1) if m else None
-        m = re.search(r"bitrate=\s*([0-9.]+)\s*kbits/s", line)
-        if m: kbps = m.group(1)
-        if kbps is None:
-            m = re.search(r"size=\s*([0-9.]+)\s*([kM]?B|KiB|MiB)", line)
-            if m and self.elapsed>0:
-                amt = float(m.group(1)); unit = m.group(2).lower()
-                if unit in ("kb","kib"): bytes_now = amt*1024
-                elif unit in ("mb","mib"): bytes_now = amt*1024*1024
-                else: bytes_now = amt
-                kbps = f"{(bytes_now*8/1000)/self.elapsed:.1f}"
-        cur = self.stats_line.cget("text")
-        cur_kbps = re.search(r"kbps:\s*([^\s]+)", cur)
-        cur_fps  = re.search(r"fps:\s*([^\s]+)", cur)
-        show_kbps = kbps if kbps is not None else (cur_kbps.group(1) if cur_kbps else "-")
-        show_fps  = fps  if fps  is not None else (cur_fps.group(1)  if cur_fps  else "-")
-        self.stats_line.config(text=f"kbps: {show_kbps}    fps: {show_fps}")
-
-    def _run(self):
-        now = dt.datetime.now()
-        if self.start_at > now:
-            total = (self.start_at - now).total_seconds()
-            while not self.stop:
-                now = dt.datetime.now()
-                remain = (self.start_at - now).total_seconds()
-                if remain <= 0: break
-                pct = 0 if total<=0 else max(0,min(100, (1 - remain/total)*100))
-                self.pb["value"]=pct
-                self.status["text"]=f"Armed. Starts in {fmt_hms(remain)}"
-                time.sleep(0.5)
-        if self.stop: return
+        self._arm_total = (self.start_at - dt.datetime.now()).total_seconds()
+        self._arm_tick()
+        self.after(200, self._flush_ui)
+
+    def _log(self, s):
+        self._pending_log.append(s); self._dirty = True
 
-        cmd = build_ffmpeg_cmd(self.ffmpeg, self.stream, self.out, self.dur_s, self.qopt, crash_safe=self.crash_safe)
+    def _flush_ui(self):
+        # Read _finished first: the ffmpeg thread sets _dirty before _finished, so a True here
+        # guarantees this tick also draws the final status, bar and "Saved:" line.
+        finished = self._finished
+        try:
+            if self._dirty:
+                self._dirty = False
+                n = len(self._pending_log)
+                if n:
+                    text = "\n".join([self._pending_log.popleft() for _ in range(n)]) + "\n"
+                    follow = self.log.yview()[1] >= 0.999  # at the bottom before this insert?
+                    self.log.insert(tk.END, text)  # one insert (one reflow) per flush
+                    # Keep roughly the last LOG_MAX_LINES; a multi-hour recording would otherwise
+                    # grow the Text widget (and every insert's cost) without bound. Lines are
+                    # counted here rather than asked of Tk, and trimmed in chunks, not per flush.
+                    self._log_lines += text.count("\n")
+                    if self._log_lines > self.LOG_MAX_LINES + self.LOG_TRIM_SLACK:
+                        self.log.delete("1.0", f"{self._log_lines - self.LOG_MAX_LINES + 1}.0")
+                        self._log_lines = self.LOG_MAX_LINES
+                    if follow: self.log.see(tk.END)  # leave a user who scrolled up where they are
+                self.pb["value"] = self._pb_value
+                self.status["text"] = self._status_text
+                self.stats_line.config(text=f"kbps: {self._last_kbps}    fps: {self._last_fps}")
+            if finished:
+                try: self.title("Recording Session — ✅ Finished")
+                except Exception: pass
+                self.open_folder_btn.configure(state="normal")
+                return
+        except tk.TclError:
+            return  # window closed
+        self.after(200, self._flush_ui)
+
+    def _update_stats_from_progress(self, key, val):
+        """One key=value line of ffmpeg's -progress output; returns elapsed seconds for out_time_*."""
+        if key in ("out_time_us", "out_time_ms"):  # both are microseconds
+            if not val.isdigit(): return None
+            self.elapsed = int(val) // 1_000_000
+            return self.elapsed
+        if key == "fps":
+            if val != self._last_fps: self._last_fps = val; self._dirty = True
+        elif key == "bitrate":
+            self._kbps_from_size = not val.endswith("kbits/s")
+            if not self._kbps_from_size:
+                val = val[:-7]
+                if val != self._last_kbps: self._last_kbps = val; self._dirty = True
+        elif key == "total_size":
+            # bitrate can be N/A (e.g. early on); derive it from the bytes written so far
+            if self._kbps_from_size and val.isdigit() and self.elapsed > 0:
+                kbps = fmt_kbps(int(val), self.elapsed)
+                if kbps != self._last_kbps: self._last_kbps = kbps; self._dirty = True
+        return None
+
+    def _handle_line(self, line):
+        """One output line from ffmpeg: -progress key=value lines update the stats, anything
+        else (banner, stream mapping, warnings; -nostats drops the stats line) is logged."""
+        key, eq, val = line.partition("=")
+        if not (eq and key.isidentifier()):
+            self._log(line)
+            return
+        elapsed = self._update_stats_from_progress(key, val.strip())  # ffmpeg pads e.g. "bitrate= 812.4kbits/s"
+        if elapsed is not None and elapsed != self._last_elapsed_shown:
+            self._last_elapsed_shown = elapsed  # out_time repeats within a second; format once
+            pct = min(100, (elapsed/self.dur_s)*100)
+            rem = max(0, self.dur_s - elapsed)
+            self._pb_value = pct
+            self._status_text = f"Recording… elapsed {fmt_hms(elapsed)}  |  remaining {fmt_hms(rem)}"
+
+    def _arm_tick(self):
+        """Countdown on the Tk event loop; launches the ffmpeg thread once start_at is reached."""
+        if self.stop: return
+        remain = (self.start_at - dt.datetime.now()).total_seconds()
+        if remain <= 0:
+            Worker(self._run_ffmpeg, dedicated=True).start()
+            return
+        total = self._arm_total
+        self._pb_value = 0 if total<=0 else max(0,min(100, (1 - remain/total)*100))
+        self._status_text = f"Armed. Starts in {fmt_hms(remain)}"
+        self._dirty = True
+        self.after(500, self._arm_tick)
+
+    def _run_ffmpeg(self):
+        cmd = build_ffmpeg_cmd(self.ffmpeg, self.stream, self.out, self.dur_s, self.qopt, crash_safe=self.crash_safe, progress=True)
         self._log("> " + " ".join(cmd))
-        ensure_dir(os.path.dirname(self.out) or ".")
+        ensure_dir(self._out_dir)
         try:
-            self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                          text=True, bufsize=1, universal_newlines=True)
+            self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
         except Exception as e:
             self._log(f"ERROR starting ffmpeg: {e}")
             return
 
-        while True:
-            if self.stop:
+        if sys.platform.startswith("linux"):
+            try:  # 1 MiB pipe so ffmpeg never blocks on a full pipe while we are busy
+                import fcntl
+                fcntl.fcntl(self.proc.stdout.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031), 1 << 20)
+            except Exception:
+                pass
+        # A blocking reader thread reads and parses ffmpeg output as soon as it is written.
+        # Parsing only updates plain attributes; the Tk thread shows them in _flush_ui,
+        # once per tick, so line parsing never runs on the UI thread.
+        def reader():
+            # Unbuffered binary pipe, read in chunks of up to 64 KiB.
+            # Some ffmpeg output ends in a bare CR, so split on CR as well as LF.
+            fd, buf = self.proc.stdout.fileno(), b""
+            try:
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk: break
+                    *parts, buf = (buf + chunk).replace(b"\r", b"\n").split(b"\n")
+                    for p in parts:
+                        if p: self._handle_line(p.decode("utf-8", "replace").rstrip())
+                if buf: self._handle_line(buf.decode("utf-8", "replace").rstrip())
+            except OSError:
+                pass
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+
+        # This thread only supervises: ask ffmpeg to stop once, then wait for the reader
+        # to reach EOF so the last lines are parsed before the "Saved:" line.
+        terminated = False
+        while reader_thread.is_alive():
+            if self.stop and not terminated:
                 try: self.proc.terminate()
                 except Exception: pass
-                break
-            line = self.proc.stdout.readline()
-            if not line:
-                if self.proc.poll() is not None: break
-                time.sleep(0.1); continue
-            line = line.rstrip()
-            if "time=" in line:
-                m = re.search(r"time=(\d+):(\d+):(\d+)", line)
-                if m:
-                    h,mn,sc = map(int, m.groups())
-                    elapsed = h*3600 + mn*60 + sc
-                    self.elapsed = elapsed
-                    pct = min(100, (elapsed/self.dur_s)*100)
-                    rem = max(0, self.dur_s - elapsed)
-                    self.pb["value"]=pct
-                    self.status["text"]=f"Recording… elapsed {fmt_hms(elapsed)}  |  remaining {fmt_hms(rem)}"
-            self._update_stats_from_line(line)
-            self._log(line)
-
-        try:
-            rest = self.proc.stdout.read()
-            if rest:
-                for ln in rest.splitlines():
-                    self._update_stats_from_line(ln); self._log(ln)
-        except Exception:
-            pass
+                terminated = True
+            reader_thread.join(timeout=0.2)
 
+        try: self.proc.wait(timeout=10)  # pipe closed; reap ffmpeg so returncode is set
+        except subprocess.TimeoutExpired: pass
         rc = self.proc.returncode if self.proc else -1
-        if os.path.exists(self.out):
-            self._log(f"Saved: {self.out}  ({fmt_bytes(os.path.getsize(self.out))})")
-        self.status["text"] = f"FFmpeg exited with code {rc}."
-        self.pb["value"]=100
-        try: self.title("Recording Session — ✅ Finished")
-        except Exception: pass
-        self.open_folder_btn.configure(state="normal")
+        try:
+            st = os.stat(self.out)
+        except OSError:
+            st = None
+        if st is not None:
+            self._log(f"Saved: {self.out}  ({fmt_bytes(st.st_size)})")
+        self._status_text = f"FFmpeg exited with code {rc}."
+        self._pb_value = 100
+        self._dirty = True
+        self._finished = True
+
+    def _end_proc(self):
+        """terminate ffmpeg and wait for it; kill it if it ignores that for 10 s."""
+        if not self.proc or self.proc.poll() is not None: return
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()  # no timeout: blocks in the OS wait, no polling loop
 
     def stop_keep(self):
         if not messagebox.askyesno(APP_TITLE, "Stop now and finalize the file so it stays playable?"):
@@ -1359,13 +2184,11 @@ class WaitRecordLive(tk.Toplevel):
         self._log("Stopping… finalizing file.")
         def finisher():
             try:
-                if self.proc and self.proc.poll() is None:
-                    self.proc.terminate()
-                    self.proc.wait(timeout=10)
+                self._end_proc()
                 finalize_recording(self.ffmpeg, self.out)
             except Exception:
                 pass
-        Worker(finisher).start()
+        Worker(finisher, dedicated=True).start()
 
     def abort_delete(self):
         if not messagebox.askyesno(APP_TITLE, "Abort recording and delete the partial file?"):
@@ -1373,25 +2196,21 @@ class WaitRecordLive(tk.Toplevel):
         self.stop=True
         def killer():
             try:
-                if self.proc and self.proc.poll() is None:
-                    self.proc.terminate()
-                    self.proc.wait(timeout=10)
+                self._end_proc()
             except Exception:
                 pass
             try:
-                if os.path.exists(self.out):
-                    os.remove(self.out)
-            except Exception:
+                os.remove(self.out)
+            except Exception:  # includes FileNotFoundError: nothing was written
                 pass
-        Worker(killer).start()
+        Worker(killer, dedicated=True).start()
 
     def on_close_window(self):
         self.stop_keep()
 
     def open_folder(self):
         try:
-            folder = os.path.dirname(os.path.abspath(self.out)) or "."
-            os.startfile(folder)
+            os.startfile(self._out_dir)
         except Exception as e:
             messagebox.showerror(APP_TITLE, f"Could not open folder:\n{e}")
 